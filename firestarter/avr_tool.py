@@ -9,6 +9,10 @@ from shutil import which
 
 logger = logging.getLogger()
 
+AVRDUDE_VERSION_REGEX = re.compile(
+    r"avrdude\s+version\s+(\d+\.\d+(\.\d+)?)", re.IGNORECASE
+)
+
 
 class AvrdudeNotFoundError(FileNotFoundError): ...
 
@@ -36,7 +40,7 @@ class Avrdude:
             self.config = self._configure_avrconf(avrdude_config_path)
         else:
             self.config = None
-        logger.info(f"Initialized Avrdude on port: {self.port}")
+        logger.info("Initialized Avrdude on port: %s", self.port)
 
     def _find_avrdude_path(self, avrdude_path):
         """Find the avrdude executable path."""
@@ -68,12 +72,10 @@ class Avrdude:
     def _get_avrdude_version(self):
         """Retrieve and validate the avrdude version."""
         stderr, _ = self._execute_command([])
-        match = re.search(
-            r"avrdude\s+version\s+(\d+\.\d+(\.\d+)?)", stderr, re.IGNORECASE
-        )
+        match = AVRDUDE_VERSION_REGEX.search(stderr)
         if match:
             version = match.group(1)
-            logger.info(f"avrdude version: {version}")
+            logger.info("avrdude version: %s", version)
             return float(version)
         logger.warning("Could not determine avrdude version.")
         return None
@@ -86,7 +88,8 @@ class Avrdude:
             if not self._trigger_reset():
                 return f"Failed to open port {self.port}.", -1
 
-        logger.info(f"Executing command: {' '.join(cmd)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Executing command: %s", " ".join(cmd))
         process = Popen(cmd, stdout=PIPE, stderr=PIPE, stdin=PIPE)
         try:
             stdout, stderr = process.communicate(timeout=30)
@@ -103,7 +106,7 @@ class Avrdude:
             time.sleep(2)
             return True
         except Exception as e:
-            logger.warning(f"Failed to trigger reset: {self.port}")
+            logger.warning("Failed to trigger reset: %s", self.port)
             return False
 
     def build_options(self, extra_flags=None):
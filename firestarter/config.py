@@ -43,12 +43,11 @@ def save_config():
     Saves the current configuration to the configuration file.
     Ensures the configuration directory exists.
     """
-    if not os.path.exists(HOME_PATH):
-        try:
-            os.makedirs(HOME_PATH)
-        except OSError as e:
-            print(f"Error: Unable to create configuration directory {HOME_PATH}: {e}")
-            return
+    try:
+        os.makedirs(HOME_PATH, exist_ok=True)
+    except OSError as e:
+        print(f"Error: Unable to create configuration directory {HOME_PATH}: {e}")
+        return
     try:
         with open(CONFIG_FILE, "w") as f:
             json.dump(config, f, indent=4)
@@ -89,12 +89,14 @@ def read_config(filename):
 def init_db():
     global proms
     global pin_maps
+    global eprom_index
     proms = read_config("database_generated.json")
     proms_man = read_config("database_overrides.json")
     proms = merge_databases(proms, proms_man)
     local_db = get_local_database()
     if local_db:
         proms = merge_databases(proms, local_db)
+    eprom_index = index_eproms(proms)
     pin_maps = read_config("pin-maps.json")
     local_pin_maps = get_local_pin_maps()
     if local_pin_maps:
@@ -119,6 +121,15 @@ def merge_databases(db, manual_db):
     return db
 
 
+def index_eproms(db):
+    # Lower case name to (ic, manufacturer), first match wins like a linear scan
+    index = {}
+    for manufacturer in db:
+        for ic in db[manufacturer]:
+            index.setdefault(ic["name"].lower(), (ic, manufacturer))
+    return index
+
+
 def merge_pin_maps(pin_maps, manual_pin_map):
     for key, sub_map in manual_pin_map.items():
         if key not in pin_maps:
@@ -227,11 +238,7 @@ def get_eproms(verified):
 
 
 def get_eprom_config(chip_name):
-    for manufacturer in proms:
-        for ic in proms[manufacturer]:
-            if chip_name.lower() == ic["name"].lower():
-                return ic, manufacturer
-    return None, None
+    return eprom_index.get(chip_name.lower(), (None, None))
 
 
 def get_eprom(chip_name, full=False):
@@ -11,18 +11,20 @@ import os
 import time
 
 try:
-    from .serial_comm import find_programmer, wait_for_response, consume_response
+    from .serial_comm import find_programmer, wait_for_response, consume_response, ACK
     from .database import get_eprom as db_get_eprom
     from .database import search_chip_id
     from .utils import extract_hex_to_decimal, print_progress_bar
 except ImportError:
-    from serial_comm import find_programmer, wait_for_response, consume_response
+    from serial_comm import find_programmer, wait_for_response, consume_response, ACK
     from database import get_eprom as db_get_eprom
     from database import search_chip_id
     from utils import extract_hex_to_decimal, print_progress_bar
 
 # Constants
 BUFFER_SIZE = 512
+END_OF_DATA = (0).to_bytes(2, byteorder="big")
+FILE_BUFFER_SIZE = 64 * 1024
 
 STATE_READ = 1
 STATE_WRITE = 2
@@ -48,7 +50,7 @@ def read(eprom_name, output_file=None, force=False, address=None, size=None):
         output_file (str): File to save the data (optional).
         force (bool): Force reading even if chip ID mismatches.
     """
-    start_time = time.time()
+    start_time = time.monotonic()
     eprom = get_eprom(eprom_name)
     if not eprom:
         print(f"EPROM {eprom_name} not found.")
@@ -78,10 +80,11 @@ def read(eprom_name, output_file=None, force=False, address=None, size=None):
     print(f"Reading EPROM {eprom_name}, saving to {output_file}")
 
     try:
-        ser.write("OK".encode("ascii"))
+        ser.write(ACK)
         ser.flush()
-        with open(output_file, "wb") as file:
+        with open(output_file, "wb", buffering=FILE_BUFFER_SIZE) as file:
             bytes_read = 0
+            block = memoryview(bytearray(BUFFER_SIZE))
             mem_size = eprom["memory-size"]
             total_iterations = (mem_size-read_address) / BUFFER_SIZE
             print_progress_bar(0, total_iterations, prefix=f"Address:        -       ")
@@ -89,20 +92,23 @@ def read(eprom_name, output_file=None, force=False, address=None, size=None):
             while True:
                 resp, info = wait_for_response(ser)
                 if resp == "DATA":
-                    data = ser.read(BUFFER_SIZE)
-                    file.write(data)
-                    bytes_read += len(data)
-                    from_address = bytes_read - len(data) + read_address
+                    # Size the last read to what is left, a full block read
+                    # would otherwise wait out the port timeout.
+                    remaining = mem_size - read_address - bytes_read
+                    nr_bytes = ser.readinto(block[: min(BUFFER_SIZE, remaining)])
+                    # Acknowledge before touching the disk so the programmer
+                    # can fetch the next block while the host writes this one.
+                    ser.write(ACK)
+                    file.write(block[:nr_bytes])
+                    bytes_read += nr_bytes
+                    from_address = bytes_read - nr_bytes + read_address
                     to_address = bytes_read + read_address - 1
                     print_progress_bar(
                         bytes_read / BUFFER_SIZE,
                         total_iterations,
                         prefix=f"Address: 0x{from_address:04X} - 0x{to_address:04X}",
-                        suffix=f"- {time.time() - start_time:.2f}s",
+                        suffix=f"- {time.monotonic() - start_time:.2f}s",
                     )
-
-                    ser.write("OK".encode("ascii"))
-                    ser.flush()
                 elif resp == "OK":
                     break
                 elif resp == "ERROR":
@@ -112,7 +118,7 @@ def read(eprom_name, output_file=None, force=False, address=None, size=None):
                 #     print(f"\nUnexpected response: {info}")
                 #     return 1
 
-            print(f"\nRead complete in: {time.time() - start_time:.2f} seconds")
+            print(f"\nRead complete in: {time.monotonic() - start_time:.2f} seconds")
             print(f"Data saved to {output_file}")
     except Exception as e:
         print(f"Error while reading: {e}")
@@ -140,7 +146,7 @@ def write(
         ignore_blank_check (bool): If True, skip blank check and erase steps.
         force (bool): Force writing even if chip ID mismatches.
     """
-    start_time = time.time()
+    start_time = time.monotonic()
     eprom = get_eprom(eprom_name)
     if not eprom:
         print(f"EPROM {eprom_name} not found.")
@@ -167,8 +173,9 @@ def write(
 
     try:
         with open(input_file, "rb") as file:
+            image = memoryview(file.read())
             mem_size = eprom["memory-size"]
-            file_size = os.path.getsize(input_file)
+            file_size = len(image)
             total_iterations = file_size / BUFFER_SIZE
 
             if file_size != mem_size:
@@ -178,12 +185,13 @@ def write(
             print(f"Writing {input_file} to {eprom_name}")
             print_progress_bar(0, total_iterations, prefix=f"Address:        -       ")
 
+            offset = 0
             while True:
-                data = file.read(BUFFER_SIZE)
+                data = image[offset : offset + BUFFER_SIZE]
+                offset += len(data)
                 if not data:
                     print("\nEnd of file reached")
-                    ser.write(int(0).to_bytes(2, byteorder="big"))
-                    ser.flush()
+                    ser.write(END_OF_DATA)
                     resp, info = wait_for_response(ser, timeout=10)
                     while resp != "OK":
                         if resp == "ERROR":
@@ -192,7 +200,6 @@ def write(
                     break
 
                 ser.write(len(data).to_bytes(2, byteorder="big"))
-                ser.flush()
                 resp, info = wait_for_response(ser)
                 while resp != "OK":
                     if resp == "ERROR":
@@ -201,7 +208,6 @@ def write(
 
                 nr_bytes = ser.write(data)
                 bytes_written += nr_bytes
-                ser.flush()
                 # print(f"Bytes written: {bytes_written}")
                 resp, info = wait_for_response(ser)
                 while resp != "OK":
@@ -217,12 +223,12 @@ def write(
                     bytes_written / BUFFER_SIZE,
                     total_iterations,
                     prefix=f"Address: 0x{from_address:04X} - 0x{to_address:04X}",
-                    suffix=f"- {time.time() - start_time:.2f}s",
+                    suffix=f"- {time.monotonic() - start_time:.2f}s",
                 )
                 if write_address + bytes_written == mem_size:
                     break
 
-            print(f"\nWrite complete in: {time.time() - start_time:.2f} seconds")
+            print(f"\nWrite complete in: {time.monotonic() - start_time:.2f} seconds")
     except Exception as e:
         print(f"Error while writing: {e}")
         return 1
@@ -232,7 +238,7 @@ def write(
     return 0
 
 def verify(eprom_name, input_file, address=None):
-    start_time = time.time()
+    start_time = time.monotonic()
     eprom = get_eprom(eprom_name)
     if not eprom:
         print(f"EPROM {eprom_name} not found.")
@@ -252,8 +258,9 @@ def verify(eprom_name, input_file, address=None):
 
     try:
         with open(input_file, "rb") as file:
+            image = memoryview(file.read())
             mem_size = eprom["memory-size"]
-            file_size = os.path.getsize(input_file)
+            file_size = len(image)
             total_iterations = file_size / BUFFER_SIZE
 
             if file_size != mem_size:
@@ -263,12 +270,13 @@ def verify(eprom_name, input_file, address=None):
             print(f"Verifying {input_file} to {eprom_name}")
             print_progress_bar(0, total_iterations, prefix=f"Address:        -       ")
 
+            offset = 0
             while True:
-                data = file.read(BUFFER_SIZE)
+                data = image[offset : offset + BUFFER_SIZE]
+                offset += len(data)
                 if not data:
                     print("\nEnd of file reached")
-                    ser.write(int(0).to_bytes(2, byteorder="big"))
-                    ser.flush()
+                    ser.write(END_OF_DATA)
                     resp, info = wait_for_response(ser, timeout=10)
                     while resp != "OK":
                         if resp == "ERROR":
@@ -277,7 +285,6 @@ def verify(eprom_name, input_file, address=None):
                     break
 
                 ser.write(len(data).to_bytes(2, byteorder="big"))
-                ser.flush()
                 resp, info = wait_for_response(ser)
                 while resp != "OK":
                     if resp == "ERROR":
@@ -286,7 +293,6 @@ def verify(eprom_name, input_file, address=None):
 
                 nr_bytes = ser.write(data)
                 bytes_written += nr_bytes
-                ser.flush()
                 resp, info = wait_for_response(ser)
                 while resp != "OK":
                     if resp == "ERROR":
@@ -301,12 +307,12 @@ def verify(eprom_name, input_file, address=None):
                     bytes_written / BUFFER_SIZE,
                     total_iterations,
                     prefix=f"Address: 0x{from_address:04X} - 0x{to_address:04X}",
-                    suffix=f"- {time.time() - start_time:.2f}s",
+                    suffix=f"- {time.monotonic() - start_time:.2f}s",
                 )
                 if verify_address + bytes_written == mem_size:
                     break
 
-            print(f"\nVerify complete in: {time.time() - start_time:.2f} seconds")
+            print(f"\nVerify complete in: {time.monotonic() - start_time:.2f} seconds")
     except Exception as e:
         print(f"Error while verifying: {e}")
         return 1
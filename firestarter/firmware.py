@@ -8,7 +8,6 @@ Firmware Management Module
 """
 
 import os
-import requests
 
 try:
     from .serial_comm import (
@@ -41,6 +40,11 @@ STATE_HW_VERSION = 15
 STATE_CONFIG = 14
 
 HOME_PATH = os.path.join(os.path.expanduser("~"), ".firestarter")
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+HTTP_TIMEOUT = 30  # Seconds to wait for the server to connect or send data
+
+# Shared HTTP session, lets the release lookup and the download reuse connections
+_session = None
 
 
 def firmware(
@@ -93,7 +97,7 @@ def firmware_check(port=None):
     print("Reading firmware version...")
     data = {"state": STATE_FW_VERSION}
 
-    ser = find_programmer(data, port)
+    ser = find_programmer(data, port, parallel=True)
     if not ser:
         return None, None, None
 
@@ -213,6 +217,22 @@ def install_firmware(
     return 1
 
 
+def http_session():
+    """
+    Returns the HTTP session shared by the firmware requests.
+
+    Returns:
+        Session: The requests session.
+    """
+    global _session
+    if _session is None:
+        # Imported here, requests is slow to load and only needed online
+        import requests
+
+        _session = requests.Session()
+    return _session
+
+
 def latest_firmware(board="uno"):
     """
     Fetches the latest firmware version and download URL.
@@ -223,7 +243,7 @@ def latest_firmware(board="uno"):
     if verbose():
         print("Fetching latest firmware release...")
 
-    response = requests.get(FIRESTARTER_RELEASE_URL)
+    response = http_session().get(FIRESTARTER_RELEASE_URL, timeout=HTTP_TIMEOUT)
     if response.status_code != 200:
         print("Failed to fetch latest firmware release.")
         return None, None
@@ -276,16 +296,16 @@ def download_firmware(url):
     Returns:
         str: Path to the downloaded firmware file.
     """
-    response = requests.get(url)
-    if response.status_code != 200:
-        return None
+    with http_session().get(url, stream=True, timeout=HTTP_TIMEOUT) as response:
+        if response.status_code != 200:
+            return None
 
-    if not os.path.exists(HOME_PATH):
-        os.makedirs(HOME_PATH)
+        os.makedirs(HOME_PATH, exist_ok=True)
 
-    firmware_path = os.path.join(HOME_PATH, "firestarter.hex")
-    with open(firmware_path, "wb") as file:
-        file.write(response.content)
+        firmware_path = os.path.join(HOME_PATH, "firestarter.hex")
+        with open(firmware_path, "wb") as file:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                file.write(chunk)
 
     return firmware_path
 
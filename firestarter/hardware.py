@@ -1,9 +1,9 @@
 import time
 
 try:
-    from .serial_comm import find_programmer, wait_for_response, consume_response
+    from .serial_comm import find_programmer, wait_for_response, consume_response, ACK
 except ImportError:
-    from serial_comm import find_programmer, wait_for_response, consume_response
+    from serial_comm import find_programmer, wait_for_response, consume_response, ACK
 
 STATE_READ_VPP = 11
 STATE_READ_VPE = 12
@@ -21,7 +21,7 @@ def hardware():
     print("Reading hardware revision...")
     data = {"state": STATE_HW_VERSION}
 
-    ser = find_programmer(data)
+    ser = find_programmer(data, parallel=True)
     if not ser:
         return 1
 
@@ -100,19 +100,18 @@ def read_voltage(state, timeout=None):
             print()
             print(f"Error reading {type} voltage: {info}")
             return 1
-        ser.write("OK".encode("ascii"))
+        ser.write(ACK)
         ser.flush()
 
         if timeout:
-            start = time.time()
+            start = time.monotonic()
 
         while (t := wait_for_response(ser))[0] == "DATA":
             print(f"\r{t[1]}", end="")
-            if timeout and time.time() > start + timeout:
+            if timeout and time.monotonic() > start + timeout:
                 print()
                 return 0
-            ser.write("OK".encode("ascii"))
-            ser.flush()
+            ser.write(ACK)
     except Exception as e:
         print(f"Error while reading {type} voltage: {e}")
     finally:
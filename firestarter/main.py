@@ -12,7 +12,6 @@ Main CLI Handler for Firestarter Project
 
 import sys
 import argparse
-import signal
 
 try:
     from .config import open_config
@@ -35,8 +34,15 @@ except ImportError:
 
 
 def main():
-    signal.signal(signal.SIGINT, exit_gracefully)
+    try:
+        return run_command()
+    except KeyboardInterrupt:
+        print("\n")
+        print("Prosess interrupted.")
+        return 1
+
 
+def run_command():
     parser = argparse.ArgumentParser(
         description="EPROM programmer for Arduino UNO and Relatively-Universal-ROM-Programmer shield."
     )
@@ -260,11 +266,5 @@ def main():
     return 0
 
 
-def exit_gracefully(signum, frame):
-    print("\n")
-    print("Prosess interrupted.")
-    sys.exit(1)
-
-
 if __name__ == "__main__":
     sys.exit(main())
@@ -7,10 +7,13 @@ Permission is hereby granted under MIT license.
 Serial Communication Module
 """
 
+import os
+import re
+import sys
 import serial
-import serial.tools.list_ports
 import time
 import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 try:
     from .config import get_config_value, set_config_value
@@ -24,6 +27,32 @@ except ImportError:
 BAUD_RATE = "250000"
 FALLBACK_BAUD_RATE = "115200"
 BUFFER_SIZE = 512
+ACK = b"OK"
+RESPONSE_TAGS = (
+    ("OK:", "OK"),
+    ("INFO:", "INFO"),
+    ("DEBUG:", "DEBUG"),
+    ("ERROR:", "ERROR"),
+    ("WARN:", "WARN"),
+    ("DATA:", "DATA"),
+)
+# Tag without the colon to response type, for lines that start with a tag
+RESPONSE_TYPES = {tag[:-1]: tag_type for tag, tag_type in RESPONSE_TAGS}
+# Progress chatter that never answers a command
+NON_RESPONSE_TYPES = frozenset(("INFO", "DEBUG"))
+NON_PRINTABLE = bytes(b for b in range(256) if not 32 <= b <= 126)
+STABILIZE_TIMEOUT = 2.0  # Time for the board to reset after the port opens
+CONSUME_QUIET_TIME = 0.1  # Silence that ends draining leftover responses
+CONSUME_TIMEOUT = 2.0  # Upper bound for draining a chatty programmer
+# Arduino, Arduino.org, FTDI, QinHeng (CH340) and Silicon Labs (CP210x)
+USB_VENDOR_IDS = frozenset((0x2341, 0x2A03, 0x0403, 0x1A86, 0x10C4))
+MANUFACTURER_REGEX = re.compile("Arduino|FTDI|CH340")
+COMPORTS_CACHE_TTL = 2.0
+USB_SERIAL_SYSFS = "/sys/bus/usb-serial/devices"
+
+# Last port enumeration and when it was made
+_comports = None
+_comports_time = 0.0
 
 
 def check_port(port, data, baud_rate=BAUD_RATE):
@@ -32,12 +61,13 @@ def check_port(port, data, baud_rate=BAUD_RATE):
 
     Args:
         port (str): The serial port to check.
-        data (str): Data to send for validation.
+        data (bytes): Encoded data to send for validation.
         baud_rate (str): Baud rate for communication.
 
     Returns:
         Serial: Open serial connection or None if unsuccessful.
     """
+    ser = None
     try:
         if verbose():
             print(f"Checking port: {port}")
@@ -47,13 +77,14 @@ def check_port(port, data, baud_rate=BAUD_RATE):
             baudrate=baud_rate,
             timeout=1.0,
         )
-        time.sleep(2)  # Allow port to stabilize
-        ser.write(data.encode("ascii"))
+        wait_until_ready(ser)
+        ser.write(data)
         ser.flush()
 
         res, msg = wait_for_response(ser)
         while res != "OK":
             if res == "ERROR":
+                ser.close()
                 return None
             res, msg = wait_for_response(ser)
 
@@ -63,54 +94,144 @@ def check_port(port, data, baud_rate=BAUD_RATE):
     except (OSError, serial.SerialException, Exception):
         if verbose():
             print(f"Failed to open port: {port}")
-        pass
+        if ser:
+            ser.close()
+        else:
+            # The port is gone, don't hand it out again from the cache
+            invalidate_comports_cache()
 
     return None
 
 
-def find_comports(port=None):
+def wait_until_ready(ser, timeout=STABILIZE_TIMEOUT):
     """
-    Finds available COM ports based on certain criteria.
+    Waits for the board to come out of the reset triggered by opening the
+    port. Returns once the firmware has sent a complete line, otherwise once
+    the timeout has passed. Single stray bytes, which the USB bridge can send
+    during the reset, are not taken as a sign that the sketch is running.
+
+    Args:
+        ser (Serial): The serial connection.
+        timeout (float): Longest time to wait, in seconds.
+    """
+    port_timeout = ser.timeout
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            ser.timeout = remaining
+            line = ser.readline()
+            if line.endswith(b"\n"):
+                parse_response(line)
+                return
+    finally:
+        ser.timeout = port_timeout
+
+
+def set_low_latency(ser):
+    """
+    Enables the driver's low latency mode, which stops USB serial adapters
+    from holding back received bytes for their latency timer (16 ms on FTDI).
+    Only available on Linux, ignored where unsupported.
 
     Args:
-        port (str): Specific port to check, if any.
+        ser (Serial): The serial connection.
+    """
+    if not sys.platform.startswith("linux"):
+        return
+
+    if hasattr(ser, "set_low_latency_mode"):
+        try:
+            ser.set_low_latency_mode(True)
+        except (ValueError, NotImplementedError, OSError):
+            if verbose():
+                print(f"Low latency mode not supported on port: {ser.portstr}")
+
+    # FTDI adapters also expose the timer itself, it needs write access
+    latency_timer = os.path.join(
+        USB_SERIAL_SYSFS, os.path.basename(ser.portstr), "latency_timer"
+    )
+    if os.path.exists(latency_timer):
+        try:
+            with open(latency_timer, "w") as file:
+                file.write("1")
+        except OSError:
+            if verbose():
+                print(f"Unable to lower latency timer: {latency_timer}")
+
+
+def find_comports():
+    """
+    Finds available COM ports based on certain criteria.
 
     Returns:
         list: List of available COM port identifiers.
     """
     ports = []
-    if port:
-        ports.append(port)
-        return ports
     saved_port = get_config_value("port")
     if saved_port:
         ports.append(saved_port)
 
-    serial_ports = serial.tools.list_ports.comports()
-    for port in serial_ports:
-        if (
+    # Known USB vendors go first, name matches catch the clones that report
+    # some other vendor id
+    name_matches = []
+    for port in _cached_comports():
+        if port.device == saved_port:
+            continue
+        if port.vid in USB_VENDOR_IDS:
+            ports.append(port.device)
+        elif (
             port.manufacturer
-            and (
-                "Arduino" in port.manufacturer
-                or "FTDI" in port.manufacturer
-                or "CH340" in port.manufacturer
-            )
+            and MANUFACTURER_REGEX.search(port.manufacturer)
             or "USB Serial" in port.description
-        ) and port.device not in ports:
-            ports.append(port.device)
+        ):
+            name_matches.append(port.device)
+    ports += name_matches
 
     if verbose():
         print(f"Found ports: {ports}")
     return ports
 
 
-def find_programmer(data, port=None):
+def _cached_comports():
+    """
+    Lists the serial ports on the system, reusing an enumeration made within
+    the last COMPORTS_CACHE_TTL seconds.
+
+    Returns:
+        list: Port info objects from serial.tools.list_ports.
+    """
+    global _comports, _comports_time
+    now = time.monotonic()
+    if _comports is None or now - _comports_time > COMPORTS_CACHE_TTL:
+        from serial.tools import list_ports
+
+        _comports = list_ports.comports()
+        _comports_time = now
+    return _comports
+
+
+def invalidate_comports_cache():
+    """
+    Drops the cached port enumeration, for when ports are known to have
+    changed, e.g. after a board reset that makes it re-enumerate.
+    """
+    global _comports
+    _comports = None
+
+
+def find_programmer(data, port=None, parallel=False):
     """
     Searches for a compatible programmer on available COM ports.
 
     Args:
         data (dict): Data to validate the programmer.
         port (str): Specific port to search.
+        parallel (bool): Probe all ports at the same time. Only for queries
+            that are harmless to send to every programmer, as each port that
+            answers has already acted on the command.
 
     Returns:
         Serial: Serial connection to the programmer or None if not found.
@@ -119,68 +240,160 @@ def find_programmer(data, port=None):
     if verbose():
         print(f"Firestarter data: {data}")
 
-    json_data = json.dumps(data, separators=(",", ":"))
+    json_data = json.dumps(data, separators=(",", ":")).encode("ascii")
     if port:
         ports = [port]
     else:
-        ports = find_comports(port)
-
-    for port in ports:
-        serial_port = check_port(port, json_data)
-        if serial_port:
-            set_config_value("port", port)
-            return serial_port
+        # The last working port is almost always still the programmer,
+        # try it before paying for a port enumeration.
+        saved_port = get_config_value("port")
+        if saved_port:
+            serial_port = check_port(saved_port, json_data)
+            if serial_port:
+                set_low_latency(serial_port)
+                return serial_port
+        ports = [p for p in find_comports() if p != saved_port]
+
+    serial_port, port = probe_ports(ports, json_data, parallel)
+    if serial_port:
+        # Only the programmer is retuned, the setting outlives close()
+        set_low_latency(serial_port)
+        set_config_value("port", port)
+        return serial_port
 
     print("No programmer found.")
     return None
 
 
-def read_response(ser):
-    while ser.in_waiting > 0:
-        byte_array = ser.readline()
-        res = read_filtered_bytes(byte_array)
-        type = None
-        msg = None
-        try:
-            if res:
-                if "OK:" in res:
-                    msg = res.split("OK:")[-1].strip()
-                    type = "OK"
-                    return
-                elif "INFO:" in res:
-                    msg = res.split("INFO:")[-1].strip()
-                    type = "INFO"
-                    return
-                elif "DEBUG:" in res:
-                    msg = res.split("DEBUG:")[-1].strip()
-                    type = "DEBUG"
-                    return
-                elif "ERROR:" in res:
-                    msg = res.split("ERROR:")[-1].strip()
-                    type = "ERROR"
-                    return
-                elif "WARN:" in res:
-                    msg = res.split("WARN:")[-1].strip()
-                    type = "WARN"
-                    return
-                elif "DATA:" in res:
-                    msg = res.split("DATA:")[-1].strip()
-                    type = "DATA"
-                    return
-                else:
-                    return
-        finally:
-            write_feedback(type, msg)
-            # if type == "ERROR":
-            #     raise Exception(msg)
-            return type, msg
+def probe_ports(ports, data, parallel=False):
+    """
+    Checks the ports in order and stops at the first that answers, so no
+    port after the programmer is sent the command. In parallel all ports
+    are checked at the same time, so the port stabilize delay and response
+    timeout are paid once instead of once per port.
+
+    Args:
+        ports (list): Serial ports to check, in order of preference.
+        data (bytes): Encoded data to send for validation.
+        parallel (bool): Send the command to all ports at the same time.
+
+    Returns:
+        tuple: Open serial connection and its port, or (None, None).
+    """
+    if not parallel or len(ports) <= 1:
+        for port in ports:
+            serial_port = check_port(port, data)
+            if serial_port:
+                return serial_port, port
+        return None, None
+
+    executor = ThreadPoolExecutor(max_workers=len(ports))
+    futures = [executor.submit(check_port, port, data) for port in ports]
+    winner = None
+    try:
+        pending = set(futures)
+        while pending and not winner:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # Ports that answered at the same time go by preference
+            winner = next((f for f in futures if f in done and f.result()), None)
+    finally:
+        # Don't wait for silent or blocking ports, close them when they finish
+        for future in futures:
+            if future is not winner and not future.cancel():
+                future.add_done_callback(_close_probe)
+        executor.shutdown(wait=False)
+
+    if winner:
+        return winner.result(), ports[futures.index(winner)]
     return None, None
 
 
+def _close_probe(future):
+    """
+    Closes the connection of a port probe that lost to another port.
+
+    Args:
+        future (Future): The finished check_port() call.
+    """
+    serial_port = future.result()
+    if serial_port:
+        serial_port.close()
+
+
+def read_response(ser):
+    """
+    Reads a single line from the serial connection, blocking until a line
+    arrives or the port timeout expires.
+
+    Args:
+        ser (Serial): The serial connection.
+
+    Returns:
+        tuple: Response type and message, (None, None) if nothing was read.
+    """
+    return parse_response(ser.readline())
+
+
+def parse_response(byte_array):
+    """
+    Parses a raw response line and writes its feedback.
+
+    Args:
+        byte_array (bytes): The line as received.
+
+    Returns:
+        tuple: Response type and message, (None, None) if it holds no tag.
+    """
+    res = read_filtered_bytes(byte_array)
+    type = None
+    msg = None
+    if res:
+        # Almost every line is a single "TAG: message", resolve those
+        # with one split. Lines holding more tags take the full scan.
+        head, sep, rest = res.partition(":")
+        if sep and head in RESPONSE_TYPES and ":" not in rest:
+            msg = rest.strip()
+            type = RESPONSE_TYPES[head]
+        else:
+            for tag, tag_type in RESPONSE_TAGS:
+                index = res.rfind(tag)
+                if index >= 0:
+                    msg = res[index + len(tag) :].strip()
+                    type = tag_type
+                    break
+
+    write_feedback(type, msg)
+    # if type == "ERROR":
+    #     raise Exception(msg)
+    return type, msg
+
+
 def consume_response(ser):
-    time.sleep(0.1)
-    while read_response(ser)[0] != None:
-        time.sleep(0.1)
+    """
+    Drains whatever the programmer still has to say, writing the feedback of
+    each line. Everything waiting is read in one go instead of line by line.
+
+    Args:
+        ser (Serial): The serial connection.
+    """
+    timeout = ser.timeout
+    ser.timeout = CONSUME_QUIET_TIME
+    deadline = time.monotonic() + CONSUME_TIMEOUT
+    pending = b""
+    try:
+        # Blocks until bytes arrive, stops once the line has been quiet
+        while time.monotonic() < deadline:
+            chunk = ser.read(max(1, ser.in_waiting))
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                parse_response(line)
+    finally:
+        ser.timeout = timeout
+    if pending:
+        parse_response(pending)
 
 
 def wait_for_response(ser, timeout=2):
@@ -193,15 +406,15 @@ def wait_for_response(ser, timeout=2):
     Returns:
         tuple: Response type (e.g., "OK") and message.
     """
-    _timeout = time.time() + timeout  # Set timeout period
-    while time.time() < _timeout:
+    _timeout = time.monotonic() + timeout  # Set timeout period
+    while time.monotonic() < _timeout:
         type, msg = read_response(ser)
         if not type:
             continue
-        if type and type != "INFO" and type != "DEBUG":
+        if type not in NON_RESPONSE_TYPES:
             return type, msg
-        _timeout = time.time() + timeout
-        
+        _timeout = time.monotonic() + timeout
+
     raise Exception(f"Timeout, no response on {ser.portstr}")
 
 
@@ -226,5 +439,5 @@ def read_filtered_bytes(byte_array):
     Returns:
         str: Filtered and decoded string or None if no valid characters.
     """
-    res = [b for b in byte_array if 32 <= b <= 126]
-    return "".join(map(chr, res)) if res else None
+    res = byte_array.translate(None, NON_PRINTABLE)
+    return res.decode("ascii") if res else None
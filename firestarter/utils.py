@@ -8,9 +8,17 @@ Utility Functions Module
 """
 
 import re
+import sys
+from functools import lru_cache
+
+# Hexadecimal number with a 0x prefix
+HEX_NUMBER_REGEX = re.compile(r"0[xX][0-9a-fA-F]+")
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
 
 # Global verbose flag
 _verbose = False
+# Whole percentage last drawn by print_progress_bar
+_last_progress = None
 
 
 def extract_hex_to_decimal(input_string):
@@ -23,7 +31,10 @@ def extract_hex_to_decimal(input_string):
     Returns:
         int: The decimal representation of the hexadecimal number, or None if not found.
     """
-    match = re.search(r"0[xX][0-9a-fA-F]+", input_string)
+    # Most messages hold no number at all, skip the regex for those
+    if "0x" not in input_string and "0X" not in input_string:
+        return None
+    match = HEX_NUMBER_REGEX.search(input_string)
     if match:
         hex_number = match.group()  # Extract the matched hexadecimal number
         return int(hex_number, 16)  # Convert to decimal
@@ -65,17 +76,43 @@ def print_progress_bar(
         length (int): Length of the progress bar.
         fill (str): Character to use for the filled portion.
         print_end (str): End character (e.g., '\r' or '\n').
+
+    Updates that don't change the whole percentage are skipped, the first and
+    last iterations are always drawn.
     """
+    global _last_progress
+    progress = int(100 * iteration // total)
+    if progress == _last_progress and 0 < iteration < total:
+        return
+    _last_progress = progress
+
     percent = f"{100 * (iteration / float(total)):.{decimals}f}"
-    filled_length = int(length * iteration // total)
-    bar = fill * filled_length + "-" * (length - filled_length)
-    if verbose():     
+    bar = progress_bar(int(length * iteration // total), length, fill)
+    if verbose():
         print(f"{prefix} |{bar}| {percent}% {suffix}")
     else:
-        print(f"\r{prefix} |{bar}| {percent}% {suffix}", end=print_end)
+        line = f"\r{prefix} |{bar}| {percent}% {suffix}{print_end}"
         # Print New Line on Complete
         if iteration == total:
-            print()
+            line += "\n"
+        sys.stdout.write(line)
+        sys.stdout.flush()
+
+
+@lru_cache(maxsize=None)
+def progress_bar(filled_length, length, fill):
+    """
+    Builds the bar part of a progress bar, there are only length + 1 of them.
+
+    Args:
+        filled_length (int): Number of filled positions.
+        length (int): Length of the progress bar.
+        fill (str): Character to use for the filled portion.
+
+    Returns:
+        str: The bar.
+    """
+    return fill * filled_length + "-" * (length - filled_length)
 
 
 def is_valid_hex_string(hex_string):
@@ -88,7 +125,7 @@ def is_valid_hex_string(hex_string):
     Returns:
         bool: True if valid hexadecimal, False otherwise.
     """
-    return bool(re.fullmatch(r"0[xX][0-9a-fA-F]+", hex_string))
+    return bool(HEX_NUMBER_REGEX.fullmatch(hex_string))
 
 
 def format_size(size_in_bytes):
@@ -101,10 +138,10 @@ def format_size(size_in_bytes):
     Returns:
         str: Human-readable file size.
     """
-    for unit in ["B", "KB", "MB", "GB", "TB"]:
-        if size_in_bytes < 1024:
-            return f"{size_in_bytes:.2f} {unit}"
-        size_in_bytes /= 1024
+    # Every unit is 10 bits, so the bit length picks the unit directly
+    bits = max(int(size_in_bytes).bit_length() - 1, 0)
+    index = min(bits // 10, len(SIZE_UNITS) - 1)
+    return f"{size_in_bytes / (1 << (10 * index)):.2f} {SIZE_UNITS[index]}"
 
 
 def time_formatter(seconds):
@@ -37,13 +37,16 @@ A18= 0x20
 
 CONTROL_REGISTER = 0xFF
 
+TOP_ADDRESS_MASK = A16 | A17 | A18 | RW
+CONTROL_MASK = A9_VPP_ENABLE | VPE_ENABLE | P1_VPP_ENABLE | REGULATOR
+
 bus_config = {'bus': [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 20], 'rw-pin': 22, 'vpp-pin': 21}
 # address = 0x123456
 
 
 def get_top_address(address):
-    top_address = (address >> 16) & (A16 | A17 | A18 | RW)
-    top_address |= CONTROL_REGISTER & (A9_VPP_ENABLE | VPE_ENABLE | P1_VPP_ENABLE | REGULATOR);
+    top_address = (address >> 16) & TOP_ADDRESS_MASK
+    top_address |= CONTROL_REGISTER & CONTROL_MASK;
     return top_address
 
 def remap_address_bus(bus_config,  address, rw) :
@@ -66,7 +69,7 @@ def remap_address_bus(bus_config,  address, rw) :
     return reorg_address
 
 def translate(reg, bit):
-    return 1 if (reg &  bit) == bit else 0
+    return (reg & bit) // bit
 
 def print_address_bus(bus_config, address, rw):
     global CONTROL_REGISTER
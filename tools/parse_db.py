@@ -7,6 +7,7 @@ Permission is hereby granted under MIT license.
 
 import xml.etree.ElementTree as ET
 import json
+from functools import lru_cache
 
 PIN_COUNT_MASK = 0x7F000000
 PLCC_MASK = 0xFF000000
@@ -81,133 +82,141 @@ types = {
 }
 
 
+@lru_cache(maxsize=None)
+def parse_hex(value):
+    # The same few attribute values repeat across thousands of ICs
+    return int(value, 16)
+
+
+def is_supported(name, attrib):
+    # Cheapest checks first, most ICs in the file are rejected on type
+    if parse_hex(attrib.get("type")) not in types:
+        return False
+    package_details = parse_hex(attrib.get("package_details"))
+    if package_details & (SMD_MASK | ICSP_MASK):
+        return False
+    pin_count = get_pin_count(package_details)
+    if pin_count < 24 or pin_count > 32:
+        return False
+    if parse_hex(attrib.get("variant")) & HITACHI_MASK_PROM_MASK:
+        return False
+    return not ("(TEST" in name or "(RW)" in name or "3.3" in name)
+
+
 def read_verified(file_path):
-    names = []
+    names = set()
     with open(file_path, "r") as file:
         for line in file:
             # Remove any leading/trailing whitespace characters (like newlines)
             name = line.strip()
-            # Add the name to the array if it's not empty
+            # Add the name to the set if it's not empty
             if name:
-                names.append(name)
+                names.add(name)
     return names
 
 
 def parse_xml_and_extract(filename):
-    tree = ET.parse(filename)
-    root = tree.getroot()
-
     all_data = {}  # Dictionary to store ICs grouped by manufacturer
 
     verified_list = read_verified("tools/verified.txt")
     seen = set()  # To track unique ICs by name and chip_id
     nr_ics = 0
-    for database in root.findall(".//database"):
-        for manufacturer in database.findall(".//manufacturer"):
-            manufacturer_name = manufacturer.get("name")
-            ics_list = all_data.get(manufacturer_name, [])
-
-            for ic in manufacturer.findall(".//ic"):
-                name = ic.get("name")
-                if "@" in name:
-                    name = name[: name.index("@")]
-                elif "(TEST" in name or "(RW)" in name:
-                    name = name[: name.index("(")]
-                variant = int(ic.get("variant"), 16) & 0xFF
-                pin_map = int(ic.get("pin_map"), 16)
-                package_details = int(ic.get("package_details"), 16)
+    manufacturer_name = None
+    # Stream the file, every element is dropped once it has been handled
+    for event, element in ET.iterparse(filename, events=("start", "end")):
+        if event == "start":
+            if element.tag == "manufacturer":
+                manufacturer_name = element.get("name")
+                ics_list = all_data.setdefault(manufacturer_name, [])
+            continue
+
+        if element.tag == "manufacturer":
+            if not ics_list:
+                del all_data[manufacturer_name]
+            manufacturer_name = None
+        elif element.tag == "ic" and manufacturer_name is not None:
+            attrib = element.attrib
+            name, at, _ = attrib.get("name").partition("@")
+            if not at and ("(TEST" in name or "(RW)" in name):
+                name = name.partition("(")[0]
+            identifier = (name, attrib.get("chip_id"))
+            if identifier not in seen and is_supported(name, attrib):
+                type = types[parse_hex(attrib.get("type"))]
+                variant = parse_hex(attrib.get("variant")) & 0xFF
+                package_details = parse_hex(attrib.get("package_details"))
                 pin_count = get_pin_count(package_details)
                 adapter = package_details & ADAPTER_MASK
-                icsp = (package_details & ICSP_MASK) >> 8
-                identifier = (name, ic.get("chip_id"))
-                type = types.get(int(ic.get("type"), 16), None)
-                flags = int(ic.get("flags"), 16)
-                can_erase = (flags & MP_ERASE_MASK) == MP_ERASE_MASK
-                has_chip_id = (flags & MP_ID_MASK) == MP_ID_MASK
-                voltages = int(ic.get("voltages"), 16)
+                flags = parse_hex(attrib.get("flags"))
+                can_erase = bool(flags & MP_ERASE_MASK)
+                has_chip_id = bool(flags & MP_ID_MASK)
+                voltages = parse_hex(attrib.get("voltages"))
                 vdd = vcc_voltages.get((voltages >> 12) & 0x0F)
                 vcc = vcc_voltages.get((voltages >> 8) & 0x0F)
                 vpp_val = voltages & 0xFF
                 vpp = vpp_voltages.get(vpp_val)
                 verified = name in verified_list
-                if (
-                    type
-                    and pin_count >= 24
-                    and pin_count <= 32
-                    and identifier not in seen
-                    and not ("(TEST" in name or "(RW)" in name)
-                    and not ("3.3" in name)
-                    # and identifier  in seen
-                    and not variant & HITACHI_MASK_PROM_MASK
-                    and not package_details & SMD_MASK == SMD_MASK
-                    and not icsp
-                    # and not vpp == None
-                ):
-
-                    mem_size = int(ic.get("code_memory_size"), 16)
-                    # p_id=ic.get("protocol_id")
-                    # if not pin_count in variants:
-                    #     variants[pin_count] = {}
-                    # if not variant in variants[pin_count]:
-                    #     variants[pin_count][variant] = {}
-                    # if not p_id in variants[pin_count][variant]:
-                    #     variants[pin_count][variant][p_id] = []
-                    # variants[pin_count][variant][p_id].append(f"{name} - {type}")
-
-                    seen.add(identifier)
-                    nr_ics = nr_ics + 1
-                    # print(ic.get("code_memory_size"))
-                    # if  vpp == None:
-                    #     print(f"{name} {variant} {pin_count} {mem_size}")
-                    # SST39VF040
-                    # if pin_count == 28:
-                    #     if type == 1:
-                    #         pin_map = 1
-                    #     elif "27" in name and "64" in name:
-                    #         pin_map = 1
-                    #     elif "27" in name and "128" in name:
-                    #         pin_map = 2
-                    #     elif "27" in name and "256" in name:
-                    #         pin_map = 3
-                    #     elif "27" in name and "512" in name:
-                    #         pin_map = 0
-                    #     else:
-                    #         pin_map = -1
-                    # else:
-                    #     pin_map = -1
-                    ic_data = {
-                        "name": name,
-                        "pin-count": pin_count,
-                        "adapter": adapter,
-                        "can-erase": can_erase,
-                        "has-chip-id": has_chip_id,
-                        "chip-id": ic.get("chip_id"),
-                        "variant": variant,
-                        "protocol-id": ic.get("protocol_id"),
-                        # "variant": ic.get("variant"),
-                        "memory-size": hex(mem_size),
-                        "type": type,
-                        "voltages": {
-                            # "raw": voltages,
-                            "vdd": vdd,
-                            "vcc": vcc,
-                            "vpp": vpp,
-                        },
-                        "pulse-delay": ic.get("pulse_delay"),
-                        "flags": ic.get("flags"),
-                        "chip-info": ic.get("chip_info"),
-                        # "pin-map": pin_map,
-                        "package-details": ic.get("package_details"),
-                        "verified": verified,
-                        # "config": ic.get("config"),
-                    }
-                    ics_list.append(ic_data)
-
-                else:
-                    seen.add(identifier)
-
-            if ics_list:
-                all_data[manufacturer_name] = ics_list
+                mem_size = parse_hex(attrib.get("code_memory_size"))
+                # p_id=attrib.get("protocol_id")
+                # if not pin_count in variants:
+                #     variants[pin_count] = {}
+                # if not variant in variants[pin_count]:
+                #     variants[pin_count][variant] = {}
+                # if not p_id in variants[pin_count][variant]:
+                #     variants[pin_count][variant][p_id] = []
+                # variants[pin_count][variant][p_id].append(f"{name} - {type}")
+
+                nr_ics = nr_ics + 1
+                # print(attrib.get("code_memory_size"))
+                # if  vpp == None:
+                #     print(f"{name} {variant} {pin_count} {mem_size}")
+                # SST39VF040
+                # if pin_count == 28:
+                #     if type == 1:
+                #         pin_map = 1
+                #     elif "27" in name and "64" in name:
+                #         pin_map = 1
+                #     elif "27" in name and "128" in name:
+                #         pin_map = 2
+                #     elif "27" in name and "256" in name:
+                #         pin_map = 3
+                #     elif "27" in name and "512" in name:
+                #         pin_map = 0
+                #     else:
+                #         pin_map = -1
+                # else:
+                #     pin_map = -1
+                ic_data = {
+                    "name": name,
+                    "pin-count": pin_count,
+                    "adapter": adapter,
+                    "can-erase": can_erase,
+                    "has-chip-id": has_chip_id,
+                    "chip-id": attrib.get("chip_id"),
+                    "variant": variant,
+                    "protocol-id": attrib.get("protocol_id"),
+                    # "variant": attrib.get("variant"),
+                    "memory-size": hex(mem_size),
+                    "type": type,
+                    "voltages": {
+                        # "raw": voltages,
+                        "vdd": vdd,
+                        "vcc": vcc,
+                        "vpp": vpp,
+                    },
+                    "pulse-delay": attrib.get("pulse_delay"),
+                    "flags": attrib.get("flags"),
+                    "chip-info": attrib.get("chip_info"),
+                    # "pin-map": pin_map,
+                    "package-details": attrib.get("package_details"),
+                    "verified": verified,
+                    # "config": attrib.get("config"),
+                }
+                ics_list.append(ic_data)
+            # Later ICs with the same name and chip id are duplicates,
+            # whether this one was kept or not
+            seen.add(identifier)
+
+        element.clear()
     # for v in variants:
     #     print(v)
     # save_to_json(pin_maps, "pin_maps.json")
@@ -218,7 +227,8 @@ def parse_xml_and_extract(filename):
 
 def save_to_json(data, filename):
     with open(filename, "w") as file:
-        json.dump(data, file, indent=4)
+        # One write, json.dump() issues a write call per token
+        file.write(json.dumps(data, indent=4))
 
 
 def main():